@@ -1,26 +1,39 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+import html
 import logging
+import os
+import string
+from datetime import datetime
+from functools import lru_cache
 from typing import Dict
 
+import uvicorn
+
 from fasthtml.common import (
     A,
     Button,
     Div,
+    EventStream,
     Form,
     H2,
     H3,
+    HttpHeader,
     Img,
     P,
+    Script,
     Section,
     Small,
-    Span,
     Titled,
     fast_app,
     Redirect,
-    serve,
+    Safe,
+    sse_message,
 )
 from starlette.requests import Request
+from starlette.responses import Response
 
 from openstack_unshelver_webapp.config import (
     ButtonSettings,
@@ -40,32 +53,95 @@ try:
 except ConfigurationError as exc:  # pragma: no cover - configuration must load at startup
     raise SystemExit(str(exc)) from exc
 
+# Plain constants for values read on every request
+APP_TITLE: str = SETTINGS.app.title
+BUTTONS: tuple[ButtonSettings, ...] = tuple(SETTINGS.buttons)
+
 GITHUB = GitHubOAuth(SETTINGS.github)
 OPENSTACK_CLIENT = OpenStackClient(SETTINGS.openstack)
-BUTTON_MAP: Dict[str, ButtonSettings] = {button.id: button for button in SETTINGS.buttons}
+BUTTON_MAP: Dict[str, ButtonSettings] = {button.id: button for button in BUTTONS}
 MANAGER = InstanceActionManager(SETTINGS.app, BUTTON_MAP, OPENSTACK_CLIENT)
 
-app, rt = fast_app(title=SETTINGS.app.title, secret_key=SETTINGS.app.secret_key)
+_GRACEFUL_SHUTDOWN_SECONDS = 5
+HTMX_SSE_EXTENSION = "https://cdn.jsdelivr.net/npm/htmx-ext-sse@2.2.3/sse.js"
+
+app, rt = fast_app(
+    title=APP_TITLE,
+    secret_key=SETTINGS.app.secret_key,
+    hdrs=(Script(src=HTMX_SSE_EXTENSION),),
+    on_startup=[MANAGER.prime_statuses],
+    on_shutdown=[MANAGER.aclose, OPENSTACK_CLIENT.close, GITHUB.aclose],
+)
 
 
 def _user_from_session(request: Request) -> dict | None:
     return request.session.get("user")
 
 
+_CARD_STYLE = (
+    "display:flex;flex-direction:column;gap:0.75rem;padding:1rem;border:1px solid #d1d5db;"
+    "border-radius:12px;min-width:260px;max-width:320px;flex:1 1 260px;"
+    "box-shadow:0 1px 2px rgba(0,0,0,0.05);background-color:#fff;"
+)
+_AVATAR_STYLE = "width:64px;height:64px;border-radius:50%;object-fit:cover;"
+
+
+def _status_card(button: ButtonSettings) -> Div:
+    children = [H3(button.label)]
+    if button.description:
+        children.append(P(button.description))
+    children.append(
+        Div(
+            Div(
+                "Loading status…",
+                id=f"status-{button.id}",
+                **{
+                    "hx-get": f"/status/{button.id}",
+                    "hx-trigger": "load",
+                    "hx-swap": "outerHTML",
+                },
+            ),
+            **{
+                "hx-ext": "sse",
+                "sse-connect": f"/status-stream/{button.id}",
+                "sse-swap": "message",
+                "hx-swap": "innerHTML",
+            },
+        )
+    )
+    return Div(*children, cls="card", style=_CARD_STYLE)
+
+
+# Page chrome that does not depend on the logged-in user is built once at import
+_LOGIN_SECTION = Section(
+    H2("OpenStack Unshelver"),
+    P("Login with GitHub (org membership required) to manage instances."),
+    A("Login with GitHub", href="/login", cls="btn btn-primary"),
+)
+_INSTRUCTIONS = P("Select an instance below to unshelve and monitor.")
+_CARD_GRID = Div(
+    *[_status_card(button) for button in BUTTONS],
+    cls="card-grid",
+    style="display:flex;flex-wrap:wrap;gap:1.5rem;align-items:stretch;margin-top:1.5rem;",
+)
+_LOGOUT_FORM = Form(
+    Button(
+        "Logout",
+        type="submit",
+        style="background:none;border:none;color:#2563eb;padding:0;font-size:0.95rem;text-decoration:underline;cursor:pointer;",
+    ),
+    method="post",
+    action="/logout",
+    style="margin-top:1.5rem;text-align:right;",
+)
+
+
 @rt("/")
 async def home(request: Request):
     user = _user_from_session(request)
     if not user:
-        return Titled(
-            SETTINGS.app.title,
-            Section(
-                H2("OpenStack Unshelver"),
-                P("Login with GitHub (org membership required) to manage instances."),
-                A("Login with GitHub", href="/login", cls="btn btn-primary"),
-            ),
-        )
+        return Titled(APP_TITLE, _LOGIN_SECTION)
 
-    cards = []
     avatar_url = user.get("avatar_url")
     profile_url = user.get("profile_url")
     user_header_children = []
@@ -73,7 +149,7 @@ async def home(request: Request):
         avatar_img = Img(
             src=avatar_url,
             alt=f"{user.get('display_name', user['login'])}'s GitHub avatar",
-            style="width:64px;height:64px;border-radius:50%;object-fit:cover;",
+            style=_AVATAR_STYLE,
             cls="avatar",
         )
         if profile_url:
@@ -93,51 +169,13 @@ async def home(request: Request):
         )
     )
 
-    for button in SETTINGS.buttons:
-        children = [H3(button.label)]
-        if button.description:
-            children.append(P(button.description))
-        children.append(
-            Div(
-                "Loading status…",
-                id=f"status-{button.id}",
-                **{
-                    "hx-get": f"/status/{button.id}",
-                    "hx-trigger": f"load, every {SETTINGS.app.poll_interval_seconds}s",
-                    "hx-swap": "outerHTML",
-                },
-            )
-        )
-        cards.append(
-            Div(
-                *children,
-                cls="card",
-                style="display:flex;flex-direction:column;gap:0.75rem;padding:1rem;border:1px solid #d1d5db;border-radius:12px;min-width:260px;max-width:320px;flex:1 1 260px;box-shadow:0 1px 2px rgba(0,0,0,0.05);background-color:#fff;",
-            )
-        )
-
-    cards_container = Div(
-        *cards,
-        cls="card-grid",
-        style="display:flex;flex-wrap:wrap;gap:1.5rem;align-items:stretch;margin-top:1.5rem;",
-    )
-
     content = Section(
         Div(*[child for child in user_header_children if child], cls="user-header"),
-        P("Select an instance below to unshelve and monitor."),
-        cards_container,
-        Form(
-            Button(
-                "Logout",
-                type="submit",
-                style="background:none;border:none;color:#2563eb;padding:0;font-size:0.95rem;text-decoration:underline;cursor:pointer;",
-            ),
-            method="post",
-            action="/logout",
-            style="margin-top:1.5rem;text-align:right;",
-        ),
+        _INSTRUCTIONS,
+        _CARD_GRID,
+        _LOGOUT_FORM,
     )
-    return Titled(SETTINGS.app.title, content)
+    return Titled(APP_TITLE, content)
 
 
 @rt("/login")
@@ -158,21 +196,22 @@ async def auth_callback(request: Request):
     params = request.query_params
     error = params.get("error")
     if error:
-        return Titled(SETTINGS.app.title, P(f"GitHub login failed: {error}"))
+        return Titled(APP_TITLE, P(f"GitHub login failed: {error}"))
 
     state = params.get("state")
-    if not state or state != request.session.get("oauth_state"):
-        return Titled(SETTINGS.app.title, P("Invalid OAuth state"))
+    expected_state = request.session.get("oauth_state")
+    if not state or not expected_state or not hmac.compare_digest(state.encode(), expected_state.encode()):
+        return Titled(APP_TITLE, P("Invalid OAuth state"))
 
     code = params.get("code")
     if not code:
-        return Titled(SETTINGS.app.title, P("Missing OAuth code"))
+        return Titled(APP_TITLE, P("Missing OAuth code"))
 
     try:
         token = await GITHUB.exchange_code_for_token(code)
         if not await GITHUB.verify_membership(token):
             return Titled(
-                SETTINGS.app.title,
+                APP_TITLE,
                 Section(
                     H2("Access Denied"),
                     P("GitHub user is not a member of the required organisation."),
@@ -181,7 +220,7 @@ async def auth_callback(request: Request):
             )
         user = await GITHUB.fetch_user(token)
     except GitHubOAuthError as exc:
-        return Titled(SETTINGS.app.title, P(f"GitHub authentication failed: {exc}"))
+        return Titled(APP_TITLE, P(f"GitHub authentication failed: {exc}"))
 
     request.session.pop("oauth_state", None)
     request.session["user"] = {
@@ -195,54 +234,62 @@ async def auth_callback(request: Request):
     return Redirect("/")
 
 
-def _format_timestamp(status: ButtonStatus) -> str:
-    return status.last_updated.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
+_ACTION_STYLE = "margin-top:auto;font-weight:600;"
 
 
-def _status_fragment(button_id: str, status: ButtonStatus) -> Div:
-    last_updated = _format_timestamp(status)
-    pieces = [
-        Small(f"Instance: `{status.instance_name}`"),
-        P(status.message),
-        Small(f"Last updated: {last_updated}"),
-    ]
+def _action_button_html(button_id: str, running: bool) -> str:
+    label, button_cls = ("Working…", "btn disabled") if running else ("Unshelve &amp; start", "btn btn-primary")
+    disabled = " disabled" if running else ""
+    return (
+        f'<button{disabled} class="{button_cls}" style="{_ACTION_STYLE}" hx-post="/action/{button_id}" '
+        f'hx-target="#status-{button_id}" hx-swap="outerHTML" hx-disabled-elt="this">{label}</button>'
+    )
+
+
+# The fragment only has a handful of variants, so it is rendered from string templates
+# instead of building and serialising a component tree on every push.
+_FRAGMENT_TEMPLATE = string.Template(
+    '<div id="status-$button_id">'
+    "<small>Instance: `$instance_name`</small>"
+    "<p>$message</p>"
+    "<small>Last updated: $last_updated</small>"
+    "$link$error$action"
+    "</div>"
+)
+_LINK_TEMPLATE = string.Template('<a href="$url" target="_blank" rel="noopener" class="btn-link">$text</a>')
+_ERROR_TEMPLATE = string.Template('<span class="error">Error: $error</span>')
+# Action button markup keyed by (button id, running)
+_ACTION_HTML: Dict[tuple[str, bool], str] = {
+    (button.id, running): _action_button_html(button.id, running) for button in BUTTONS for running in (False, True)
+}
+
+
+@lru_cache(maxsize=256)
+def _format_timestamp(timestamp: datetime) -> str:
+    # Every viewer of a status renders the same timestamp, so format it only once
+    return timestamp.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
+
+
+def _status_fragment(button_id: str, status: ButtonStatus) -> Safe:
+    link = ""
     if status.url:
-        link_text = "Open web app" if status.http_ready else "Open anyway"
-        pieces.append(
-            A(
-                link_text,
-                href=status.url,
-                target="_blank",
-                rel="noopener",
-                cls="btn-link",
-            )
+        link = _LINK_TEMPLATE.substitute(
+            url=html.escape(status.url),
+            text="Open web app" if status.http_ready else "Open anyway",
         )
-    if status.error:
-        pieces.append(Span(f"Error: {status.error}", cls="error"))
-
-    pieces.append(
-        Button(
-            "Unshelve & start" if not status.running else "Working…",
-            hx_post=f"/action/{button_id}",
-            hx_target=f"#status-{button_id}",
-            hx_swap="outerHTML",
-            hx_disabled_elt="this",
-            disabled=status.running,
-            cls="btn btn-primary" if not status.running else "btn disabled",
-            style="margin-top:auto;font-weight:600;",
+    error = _ERROR_TEMPLATE.substitute(error=html.escape(status.error)) if status.error else ""
+    return Safe(
+        _FRAGMENT_TEMPLATE.substitute(
+            button_id=button_id,
+            instance_name=html.escape(status.instance_name),
+            message=html.escape(status.message),
+            last_updated=_format_timestamp(status.last_updated),
+            link=link,
+            error=error,
+            action=_ACTION_HTML[button_id, status.running],
         )
     )
 
-    return Div(
-        *pieces,
-        id=f"status-{button_id}",
-        **{
-            "hx-get": f"/status/{button_id}",
-            "hx-trigger": f"load, every {SETTINGS.app.poll_interval_seconds}s",
-            "hx-swap": "outerHTML",
-        },
-    )
-
 
 @rt("/status/{button_id}")
 async def status_view(request: Request, button_id: str):
@@ -252,7 +299,49 @@ async def status_view(request: Request, button_id: str):
         status = await MANAGER.refresh_openstack_status(button_id)
     except KeyError:
         return Div("Unknown action", id=f"status-{button_id}")
-    return _status_fragment(button_id, status)
+
+    etag = _status_etag(status)
+    if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return (
+        _status_fragment(button_id, status),
+        HttpHeader("ETag", etag),
+        HttpHeader("Cache-Control", "max-age=0, stale-if-error=60"),
+    )
+
+
+def _status_etag(status: ButtonStatus) -> str:
+    rendered = (
+        status.instance_name,
+        status.state,
+        status.message,
+        status.running,
+        status.url,
+        status.http_ready,
+        status.error,
+        status.last_updated.isoformat(),
+    )
+    digest = hashlib.blake2b(repr(rendered).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _parse_if_none_match(header: str | None) -> list[str]:
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",")]
+
+
+@rt("/status-stream/{button_id}")
+async def status_stream(request: Request, button_id: str):
+    # 204 tells the browser's EventSource not to reconnect
+    if not _user_from_session(request) or button_id not in BUTTON_MAP:
+        return Response(status_code=204)
+
+    async def events():
+        async for status in MANAGER.subscribe(button_id):
+            yield sse_message(_status_fragment(button_id, status))
+
+    return EventStream(events())
 
 
 @rt("/action/{button_id}", methods=["POST"])
@@ -267,4 +356,16 @@ async def trigger_unshelve(request: Request, button_id: str):
 
 
 if __name__ == "__main__":
-    serve()
+    # Task status lives in-process, so extra workers only make sense behind sticky routing.
+    uvicorn.run(
+        "app:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", 5001)),
+        loop="auto",
+        http="httptools",
+        workers=int(os.environ.get("WEB_WORKERS", 1)),
+        # Open SSE streams never finish on their own; cut them off so the shutdown hooks still run
+        timeout_graceful_shutdown=_GRACEFUL_SHUTDOWN_SECONDS,
+        log_level="warning",
+        access_log=False,
+    )
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 import os
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import yaml
 from pydantic import AnyUrl, BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 DEFAULT_CONFIG_PATH = "config.yaml"
 CONFIG_ENV_VAR = "UNSHELVER_CONFIG"
+SKIP_CACHE_ENV_VAR = "UNSHELVER_SKIP_CACHE"
 
 
 class AppSettings(BaseModel):
@@ -77,6 +86,23 @@ class OpenStackSettings(BaseModel):
             "application_credential_id/application_credential_secret"
         )
 
+    @cached_property
+    def as_kwargs(self) -> Mapping[str, Any]:
+        """Read-only keyword arguments for ``openstack.connection.Connection``."""
+
+        # Plain attribute reads give the same result as model_dump(exclude_none=True,
+        # mode="json") here: auth_url is the only field that is not already JSON-native.
+        kwargs: Dict[str, Any] = {}
+        for name in type(self).model_fields:
+            value = getattr(self, name)
+            if value is not None:
+                kwargs[name] = value
+        kwargs["auth_url"] = str(self.auth_url)
+        for name, value in (self.model_extra or {}).items():
+            if value is not None:
+                kwargs[name] = value
+        return MappingProxyType(kwargs)
+
 
 class ButtonSettings(BaseModel):
     """Defines a UI button and the instance it controls."""
@@ -96,17 +122,12 @@ class ButtonSettings(BaseModel):
     http_probe_interval_seconds: Optional[int] = Field(default=None, ge=1)
     verify_tls: bool = True
 
-    @field_validator("healthcheck_path")
-    @classmethod
-    def normalise_healthcheck_path(cls, value: str) -> str:
-        return value if value.startswith("/") else f"/{value}"
-
-    @field_validator("launch_path")
+    @field_validator("healthcheck_path", "launch_path")
     @classmethod
-    def normalise_launch_path(cls, value: Optional[str]) -> Optional[str]:
-        if value is None:
+    def normalise_path(cls, value: Optional[str]) -> Optional[str]:
+        if value is None or value[:1] == "/":
             return value
-        return value if value.startswith("/") else f"/{value}"
+        return f"/{value}"
 
 
 class Settings(BaseModel):
@@ -136,23 +157,71 @@ class ConfigurationError(RuntimeError):
     """Raised when configuration loading fails."""
 
 
-def _load_yaml(path: Path) -> Dict[str, Any]:
+# Validated settings keyed by the SHA-256 of the raw configuration file
+_SETTINGS_CACHE: Dict[str, Settings] = {}
+# (mtime_ns, size) of each loaded path and the digest its contents had at the time
+_STAT_CACHE: Dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+def clear_settings_cache() -> None:
+    """Forget all previously loaded settings."""
+
+    _SETTINGS_CACHE.clear()
+    _STAT_CACHE.clear()
+
+
+def _stat_signature(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_config(path: Path) -> bytes:
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            return yaml.safe_load(handle) or {}
+        return path.read_bytes()
     except FileNotFoundError as exc:
         raise ConfigurationError(f"Configuration file not found: {path}") from exc
+
+
+def _load_yaml(data: bytes) -> Dict[str, Any]:
+    try:
+        return yaml.load(data, Loader=_YamlLoader) or {}
     except yaml.YAMLError as exc:
         raise ConfigurationError(f"Failed to parse YAML configuration: {exc}") from exc
 
 
 def load_settings(path: Optional[str] = None) -> Settings:
-    """Load settings from a YAML file, defaulting to UNSHELVER_CONFIG or config.yaml."""
+    """Load settings from a YAML file, defaulting to UNSHELVER_CONFIG or config.yaml.
+
+    Validated settings are cached per file content, and an unchanged file (same mtime
+    and size) is not even re-read. Set UNSHELVER_SKIP_CACHE to bypass the cache.
+    """
 
     resolved_path = Path(path or os.environ.get(CONFIG_ENV_VAR, DEFAULT_CONFIG_PATH))
-    raw_config = _load_yaml(resolved_path)
+    use_cache = not os.environ.get(SKIP_CACHE_ENV_VAR)
+    signature = _stat_signature(resolved_path)
+    if use_cache and signature is not None:
+        known = _STAT_CACHE.get(resolved_path)
+        if known and known[0] == signature and known[1] in _SETTINGS_CACHE:
+            return _SETTINGS_CACHE[known[1]]
+
+    data = _read_config(resolved_path)
+    key = hashlib.sha256(data).hexdigest()
+    if use_cache and signature is not None:
+        _STAT_CACHE[resolved_path] = (signature, key)
+    if use_cache and key in _SETTINGS_CACHE:
+        return _SETTINGS_CACHE[key]
+
+    raw_config = _load_yaml(data)
+    # Every distinct file is fully validated: model_construct would skip the path
+    # normalisers and cross-field checks, and the YAML file is not trusted input.
     try:
-        return Settings.model_validate(raw_config)
+        settings = Settings.model_validate(raw_config)
     except ValidationError as exc:
         errors = exc.errors(include_url=False)
         raise ConfigurationError(f"Configuration validation error: {errors}") from exc
+    if use_cache:
+        _SETTINGS_CACHE[key] = settings
+    return settings
@@ -44,6 +44,7 @@ class GitHubOAuth:
     def __init__(self, settings: GitHubSettings, http_timeout: float = 15.0) -> None:
         self._settings = settings
         self._timeout = http_timeout
+        self._client: Optional[httpx.AsyncClient] = None
 
     @staticmethod
     def build_state() -> str:
@@ -62,18 +63,18 @@ class GitHubOAuth:
         return f"{GITHUB_AUTHORIZE_URL}?{query}"
 
     async def exchange_code_for_token(self, code: str) -> GitHubToken:
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                GITHUB_TOKEN_URL,
-                headers={"Accept": "application/json"},
-                data=
-                {
-                    "client_id": self._settings.client_id,
-                    "client_secret": self._settings.client_secret,
-                    "code": code,
-                    "redirect_uri": str(self._settings.redirect_uri),
-                },
-            )
+        client = self._get_client()
+        response = await client.post(
+            GITHUB_TOKEN_URL,
+            headers={"Accept": "application/json"},
+            data=
+            {
+                "client_id": self._settings.client_id,
+                "client_secret": self._settings.client_secret,
+                "code": code,
+                "redirect_uri": str(self._settings.redirect_uri),
+            },
+        )
         if response.status_code != 200:
             raise GitHubOAuthError(
                 f"Failed to exchange OAuth code. HTTP {response.status_code}: {response.text}"
@@ -88,8 +89,7 @@ class GitHubOAuth:
 
     async def fetch_user(self, token: GitHubToken) -> GitHubUser:
         headers = self._auth_headers(token)
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(f"{GITHUB_API_BASE}/user", headers=headers)
+        response = await self._get_client().get(f"{GITHUB_API_BASE}/user", headers=headers)
         if response.status_code != 200:
             raise GitHubOAuthError(
                 f"Failed to retrieve GitHub user profile. HTTP {response.status_code}: {response.text}"
@@ -104,11 +104,10 @@ class GitHubOAuth:
 
     async def verify_membership(self, token: GitHubToken) -> bool:
         headers = self._auth_headers(token)
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(
-                f"{GITHUB_API_BASE}/user/memberships/orgs/{self._settings.organization}",
-                headers=headers,
-            )
+        response = await self._get_client().get(
+            f"{GITHUB_API_BASE}/user/memberships/orgs/{self._settings.organization}",
+            headers=headers,
+        )
         if response.status_code == 200:
             payload = response.json()
             return payload.get("state") == "active"
@@ -118,6 +117,22 @@ class GitHubOAuth:
             f"Unable to verify membership. HTTP {response.status_code}: {response.text}"
         )
 
+    async def aclose(self) -> None:
+        """Close the shared HTTP client; a new one is created on next use."""
+
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One pooled client keeps TLS connections to GitHub alive between logins
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(max_keepalive_connections=10),
+            )
+        return self._client
+
     def _auth_headers(self, token: GitHubToken) -> dict[str, str]:
         return {
             "Authorization": f"Bearer {token.access_token}",
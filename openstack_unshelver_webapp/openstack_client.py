@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import ipaddress
 import logging
+import re
+import threading
+import time
+import uuid
 from typing import Any, Iterable, Optional
 
 from openstack import connection
@@ -14,8 +18,15 @@ from .config import ButtonSettings, OpenStackSettings
 
 _LOGGER = logging.getLogger(__name__)
 
+_DNS_CACHE_TTL_SECONDS = 300.0
+# Designate lookups shared by all clients: address -> (expiry, DNS name or None)
+_DNS_CACHE: dict[str, tuple[float, Optional[str]]] = {}
+_DNS_CACHE_LOCK = threading.Lock()
+# Whether the cloud catalog offers Designate; probed once per process
+_DESIGNATE_AVAILABLE: Optional[bool] = None
 
-@dataclass(slots=True)
+
+@dataclass(frozen=True, slots=True)
 class InstanceEndpoint:
     address: str
     scheme: str
@@ -23,21 +34,19 @@ class InstanceEndpoint:
     launch_path: str
     healthcheck_path: str
     verify_tls: bool
+    # Derived once in __post_init__ since they are read on every probe and status update
+    base_url: str = field(init=False)
+    launch_url: str = field(init=False)
+    healthcheck_url: str = field(init=False)
 
-    @property
-    def base_url(self) -> str:
+    def __post_init__(self) -> None:
         host = format_host(self.address)
         default_port = 80 if self.scheme == "http" else 443 if self.scheme == "https" else None
         port_part = "" if self.port in (None, default_port) else f":{self.port}"
-        return f"{self.scheme}://{host}{port_part}"
-
-    @property
-    def launch_url(self) -> str:
-        return f"{self.base_url}{self.launch_path}"
-
-    @property
-    def healthcheck_url(self) -> str:
-        return f"{self.base_url}{self.healthcheck_path}"
+        base_url = f"{self.scheme}://{host}{port_part}"
+        object.__setattr__(self, "base_url", base_url)
+        object.__setattr__(self, "launch_url", f"{base_url}{self.launch_path}")
+        object.__setattr__(self, "healthcheck_url", f"{base_url}{self.healthcheck_path}")
 
 
 class OpenStackClient:
@@ -45,36 +54,80 @@ class OpenStackClient:
 
     def __init__(self, settings: OpenStackSettings) -> None:
         self._settings = settings
-        self._dns_cache: dict[str, Optional[str]] = {}
+        self._local = threading.local()
+        self._conns: list[connection.Connection] = []
+        self._conns_lock = threading.Lock()
 
     def create_connection(self) -> connection.Connection:
-        payload = self._settings.model_dump(exclude_none=True, mode="json")
-        return connection.Connection(**payload)
+        return connection.Connection(**self._settings.as_kwargs)
+
+    def _get_connection(self) -> connection.Connection:
+        """Return the calling thread's connection, creating it on first use.
+
+        Keeping connections alive reuses their Keystone token and HTTP pool across
+        calls; each thread gets its own because connections are not thread-safe.
+        """
+
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = self.create_connection()
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every pooled connection.
+
+        Connections are closed from the calling thread, so only call this once no
+        other thread is using the client, e.g. after the manager's worker pool has
+        shut down.
+        """
+
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            # Threads pick up a fresh connection on their next call
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
 
     def find_server(self, instance_name: str) -> Optional[Server]:
-        conn = self.create_connection()
-        try:
-            return conn.compute.find_server(instance_name, ignore_missing=True)
-        finally:
-            conn.close()
+        conn = self._get_connection()
+        return conn.compute.find_server(instance_name, ignore_missing=True)
+
+    def list_servers(self, instance_names: Iterable[str]) -> dict[str, Server]:
+        """Fetch the named servers with one filtered listing call, keyed by the requested name."""
+
+        wanted = list(dict.fromkeys(instance_names))
+        if not wanted:
+            return {}
+        # Nova treats the name filter as a regex, so anchor it to match the names exactly
+        pattern = "^(" + "|".join(map(re.escape, wanted)) + ")$"
+        conn = self._get_connection()
+        servers: dict[str, Server] = {}
+        for server in conn.compute.servers(details=True, name=pattern):
+            if server.name in wanted:
+                servers.setdefault(server.name, server)
+        # Only IDs can still resolve after the name filter missed; looking up every
+        # missing name would cost a round trip per absent instance on each refresh
+        for name in wanted:
+            if name not in servers and _looks_like_server_id(name):
+                server = conn.compute.find_server(name, ignore_missing=True)
+                if server is not None:
+                    servers[name] = server
+        return servers
 
     def unshelve_server(self, server_id: str) -> None:
-        conn = self.create_connection()
-        try:
-            server = conn.compute.get_server(server_id)
-            conn.compute.unshelve_server(server)
-        finally:
-            conn.close()
+        conn = self._get_connection()
+        server = conn.compute.get_server(server_id)
+        conn.compute.unshelve_server(server)
 
     def get_server(self, server_id: str) -> Server:
-        conn = self.create_connection()
-        try:
-            server = conn.compute.get_server(server_id)
-            if server is None:
-                raise ResourceNotFound(f"Server {server_id} not found")
-            return server
-        finally:
-            conn.close()
+        conn = self._get_connection()
+        server = conn.compute.get_server(server_id)
+        if server is None:
+            raise ResourceNotFound(f"Server {server_id} not found")
+        return server
 
     def build_endpoint(self, server: Server, button: ButtonSettings) -> Optional[InstanceEndpoint]:
         address = select_address(server, button.preferred_networks)
@@ -99,66 +152,85 @@ class OpenStackClient:
             # Already a hostname
             return address
 
-        if address in self._dns_cache:
-            return self._dns_cache[address]
+        if _DESIGNATE_AVAILABLE is False:
+            return None
+
+        with _DNS_CACHE_LOCK:
+            cached = _DNS_CACHE.get(address)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
 
-        result: Optional[str] = None
-        conn = self.create_connection()
+        records: dict[str, str] = {}
         try:
-            result = self._lookup_designate_record(conn, address)
+            conn = self._get_connection()
+            if not _designate_available(conn):
+                return None
+            records = self._index_designate_records(conn)
         except SDKException as exc:  # pragma: no cover - requires live OpenStack
             _LOGGER.debug("Designate lookup failed for %s: %s", address, exc, exc_info=True)
-        finally:
-            conn.close()
 
-        if result:
-            result = result.rstrip(".")
-        self._dns_cache[address] = result
-        return result
+        # Cache every address seen during the sweep, plus a negative entry for this one
+        expires_at = time.monotonic() + _DNS_CACHE_TTL_SECONDS
+        with _DNS_CACHE_LOCK:
+            for record_address, name in records.items():
+                _DNS_CACHE[record_address] = (expires_at, name)
+            _DNS_CACHE[address] = (expires_at, records.get(address))
+        return records.get(address)
 
     @staticmethod
-    def _lookup_designate_record(conn: connection.Connection, address: str) -> Optional[str]:
-        for zone in conn.dns.zones():  # pragma: no cover - requires live OpenStack
+    def _index_designate_records(conn: connection.Connection) -> dict[str, str]:
+        """Map every A record address to its name in a single sweep over all zones."""
+
+        index: dict[str, str] = {}
+        for zone in conn.dns.zones():
             zone_id = _extract(zone, "id")
             if not zone_id:
                 continue
-            for recordset in conn.dns.recordsets(zone_id):
+            # Filter server-side so other record types are never paged through
+            for recordset in conn.dns.recordsets(zone_id, type="A"):
                 record_type = _extract(recordset, "type")
                 if (record_type or "").upper() != "A":
                     continue
-                records = _extract(recordset, "records") or []
-                if address in records:
-                    name = _extract(recordset, "name")
-                    if name:
-                        return name
-        return None
+                name = _extract(recordset, "name")
+                if not name:
+                    continue
+                for record_address in _extract(recordset, "records") or []:
+                    index.setdefault(record_address, name.rstrip("."))
+        return index
 
 
 def select_address(server: Server, preferred_networks: Optional[Iterable[str]] = None) -> Optional[str]:
-    """Given a server, pick the best IP address to contact it."""
+    """Given a server, pick the best IP address to contact it.
+
+    Addresses on preferred networks win (in the configured order, IPv4 first), then
+    floating IPs, then IPv4, then any other address. Ties keep the reported order.
+    """
 
     addresses = getattr(server, "addresses", {}) or {}
-    # Preferred networks override all other logic
-    if preferred_networks:
-        for network in preferred_networks:
-            ip = _first_address(addresses.get(network, []))
-            if ip:
-                return ip
-    # Floating IPs are the next best option
-    for candidates in addresses.values():
-        ip = _first_address(candidates, preferred_type="floating")
-        if ip:
-            return ip
-    # Fall back to IPv4 addresses
-    for candidates in addresses.values():
-        ip = _first_address(candidates, prefer_ipv4=True)
-        if ip:
-            return ip
-    # Any other address
-    for candidates in addresses.values():
-        ip = _first_address(candidates, prefer_ipv4=False)
-        if ip:
-            return ip
+    preferred_rank: dict[str, int] = {}
+    for rank, network in enumerate(preferred_networks or ()):
+        preferred_rank.setdefault(network, rank)
+
+    # Single pass over every address, keeping the highest scoring one
+    best: Optional[str] = None
+    best_score: Optional[tuple[int, int, bool]] = None
+    for network, candidates in addresses.items():
+        rank = preferred_rank.get(network)
+        for entry in candidates or ():
+            if not isinstance(entry, dict) or not entry.get("addr"):
+                continue
+            is_ipv4 = entry.get("version") == 4
+            if rank is not None:
+                score = (3, -rank, is_ipv4)
+            elif entry.get("OS-EXT-IPS:type") == "floating":
+                score = (2, 0, False)
+            else:
+                score = (1, 0, is_ipv4)
+            if best_score is None or score > best_score:
+                best, best_score = entry["addr"], score
+    if best:
+        return best
+
     # Final fallback: accessIPv4/accessIPv6 fields
     access_v4 = getattr(server, "accessIPv4", None)
     if access_v4:
@@ -169,21 +241,25 @@ def select_address(server: Server, preferred_networks: Optional[Iterable[str]] =
     return None
 
 
-def _first_address(candidates: Optional[Iterable[dict]], preferred_type: Optional[str] = None, prefer_ipv4: bool = True) -> Optional[str]:
-    if not candidates:
-        return None
-    entries = [c for c in candidates if isinstance(c, dict) and c.get("addr")]
-    if preferred_type:
-        for entry in entries:
-            if entry.get("OS-EXT-IPS:type") == preferred_type:
-                return entry["addr"]
-    if prefer_ipv4:
-        for entry in entries:
-            if entry.get("version") == 4:
-                return entry["addr"]
-    for entry in entries:
-        return entry["addr"]
-    return None
+def server_status(server: Any) -> str:
+    """Return the upper-cased Nova status of a server, or an empty string if it has none."""
+
+    return (getattr(server, "status", None) or "").upper()
+
+
+def _designate_available(conn: connection.Connection) -> bool:
+    global _DESIGNATE_AVAILABLE
+    if _DESIGNATE_AVAILABLE is None:
+        _DESIGNATE_AVAILABLE = bool(conn.has_service("dns"))
+    return _DESIGNATE_AVAILABLE
+
+
+def _looks_like_server_id(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
 
 
 def format_host(address: str) -> str:
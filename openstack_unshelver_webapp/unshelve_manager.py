@@ -1,32 +1,77 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set, TypeVar
 
 import httpx
+from keystoneauth1.exceptions import ClientException as KeystoneError
 from openstack.compute.v2.server import Server
 from openstack.exceptions import ResourceNotFound, SDKException
 
 from .config import AppSettings, ButtonSettings
-from .openstack_client import InstanceEndpoint, OpenStackClient
+from .openstack_client import InstanceEndpoint, OpenStackClient, server_status
 
 
 _LOGGER = logging.getLogger(__name__)
 _UNSET = object()
+_MAX_BOOT_POLL_SECONDS = 30
+_OPENSTACK_WORKERS = 4
+_SHELVED_STATES = frozenset({"SHELVED", "SHELVED_OFFLOADED"})
+_FAILED_STATES = frozenset({"ERROR", "UNKNOWN"})
+# Failures that mean OpenStack itself is unreachable or unhappy, as opposed to bugs here
+_OPENSTACK_ERRORS = (SDKException, KeystoneError)
+
+_T = TypeVar("_T")
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _format_openstack_status(status: str) -> str:
+def _title_status(status: str) -> str:
     cleaned = (status or "UNKNOWN").replace("_", " ")
     return cleaned.strip().title() or "Unknown"
 
 
+# Display names for every server status Nova reports, computed once
+_STATUS_DISPLAY: Dict[str, str] = {
+    status: _title_status(status)
+    for status in (
+        "ACTIVE",
+        "BUILD",
+        "DELETED",
+        "ERROR",
+        "HARD_REBOOT",
+        "MIGRATING",
+        "PASSWORD",
+        "PAUSED",
+        "REBOOT",
+        "REBUILD",
+        "RESCUE",
+        "RESIZE",
+        "REVERT_RESIZE",
+        "SHELVED",
+        "SHELVED_OFFLOADED",
+        "SHUTOFF",
+        "SOFT_DELETED",
+        "SUSPENDED",
+        "UNKNOWN",
+        "VERIFY_RESIZE",
+    )
+}
+
+
+def _format_openstack_status(status: str) -> str:
+    display = _STATUS_DISPLAY.get(status)
+    return display if display is not None else _title_status(status)
+
+
 @dataclass(slots=True)
 class ButtonStatus:
     button_id: str
@@ -53,6 +98,17 @@ class ButtonStatus:
         }
 
 
+def _describe_server(server: Optional[Server]) -> str:
+    if not server:
+        return "Instance not found in OpenStack."
+    raw_status = server_status(server) or "UNKNOWN"
+    return f"Instance status: {_format_openstack_status(raw_status)}."
+
+
+def _fingerprint(status: ButtonStatus) -> tuple:
+    return (status.state, status.message, status.running, status.url, status.http_ready, status.error)
+
+
 class InstanceActionManager:
     """Coordinates unshelve requests and status tracking."""
 
@@ -77,27 +133,44 @@ class InstanceActionManager:
             for button_id, button in buttons.items()
         }
         self._tasks: Dict[str, asyncio.Task] = {}
-        self._lock = asyncio.Lock()
-        self._prime_initial_statuses()
-
-    def _prime_initial_statuses(self) -> None:
+        self._locks: Dict[str, asyncio.Lock] = {button_id: asyncio.Lock() for button_id in buttons}
+        self._subscribers: Dict[str, Set[asyncio.Queue[ButtonStatus]]] = {
+            button_id: set() for button_id in buttons
+        }
+        self._poller: Optional[asyncio.Task] = None
+        self._refresh_locks: Dict[str, asyncio.Lock] = {button_id: asyncio.Lock() for button_id in buttons}
+        self._refreshed_at: Dict[str, float] = {}
+        # Outage error last published on top of the stored status, per button
+        self._stale_errors: Dict[str, str] = {}
+        # Probe clients keyed by (verify_tls, timeout) so keep-alive connections survive between attempts
+        self._http_clients: Dict[tuple[bool, float], httpx.AsyncClient] = {}
+        # Dedicated pool for blocking OpenStack calls; each worker keeps its own connection
+        self._executor = ThreadPoolExecutor(max_workers=_OPENSTACK_WORKERS, thread_name_prefix="openstack")
+
+    async def _run_blocking(self, func: Callable[..., _T], *args: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def prime_statuses(self) -> None:
+        """Fill in the initial OpenStack status of every button.
+
+        Run from the application's startup hook so the OpenStack round trip happens
+        off the event loop instead of blocking construction.
+        """
+
+        names = [button.instance_name for button in self._buttons.values()]
+        try:
+            # One listing call covers every button instead of a lookup per instance
+            servers = await self._run_blocking(self._client.list_servers, names)
+        except _OPENSTACK_ERRORS as exc:
+            _LOGGER.debug("Initial status refresh failed for %s: %s", ", ".join(names), exc, exc_info=True)
+            servers = None
         for button_id, button in self._buttons.items():
-            try:
-                server = self._client.find_server(button.instance_name)
-            except SDKException as exc:
-                _LOGGER.debug("Initial status refresh failed for %s: %s", button.instance_name, exc, exc_info=True)
+            if servers is None:
                 message = "Unable to query OpenStack status right now."
             else:
-                if not server:
-                    message = "Instance not found in OpenStack."
-                else:
-                    raw_status = (getattr(server, "status", None) or "").upper() or "UNKNOWN"
-                    display_status = _format_openstack_status(raw_status)
-                    message = f"Instance status: {display_status}."
-            self._statuses[button_id] = replace(
-                self._statuses[button_id],
-                message=message,
-            )
+                message = _describe_server(servers.get(button.instance_name))
+            self._statuses[button_id].message = message
 
     def get_status(self, button_id: str) -> ButtonStatus:
         status = self._statuses.get(button_id)
@@ -111,66 +184,154 @@ class InstanceActionManager:
             raise KeyError(f"Unknown button id '{button_id}'")
 
         status = self._statuses[button_id]
-        if status.running:
+        if status.running or self._is_fresh(button_id):
             return status
 
-        try:
-            server = await asyncio.to_thread(self._client.find_server, button.instance_name)
-        except SDKException as exc:
-            _LOGGER.debug("Failed to refresh status for %s: %s", button.instance_name, exc, exc_info=True)
-            return await self._update_status(
-                button_id,
-                message="Unable to query OpenStack status right now.",
-            )
-
-        if not server:
-            return await self._update_status(
-                button_id,
-                message="Instance not found in OpenStack.",
-            )
+        async with self._refresh_locks[button_id]:
+            # Another caller may have refreshed the status while we waited for the lock
+            status = self._statuses[button_id]
+            if status.running or self._is_fresh(button_id):
+                return status
 
-        raw_status = (getattr(server, "status", None) or "").upper() or "UNKNOWN"
-        display_status = _format_openstack_status(raw_status)
+            try:
+                server = await self._run_blocking(self._client.find_server, button.instance_name)
+            except _OPENSTACK_ERRORS as exc:
+                _LOGGER.debug("Failed to refresh status for %s: %s", button.instance_name, exc, exc_info=True)
+                return await self._record_refresh_failure(button_id, exc)
+            return await self._record_server_status(button_id, server)
+
+    async def refresh_all_statuses(self, button_ids: Optional[Iterable[str]] = None) -> Dict[str, ButtonStatus]:
+        """Refresh several buttons at once using a single OpenStack listing call."""
+
+        selected = list(self._buttons) if button_ids is None else list(button_ids)
+        for button_id in selected:
+            if button_id not in self._buttons:
+                raise KeyError(f"Unknown button id '{button_id}'")
+
+        stale = [
+            button_id
+            for button_id in selected
+            if not self._statuses[button_id].running and not self._is_fresh(button_id)
+        ]
+        if stale:
+            names = [self._buttons[button_id].instance_name for button_id in stale]
+            try:
+                servers = await self._run_blocking(self._client.list_servers, names)
+            except _OPENSTACK_ERRORS as exc:
+                _LOGGER.debug("Failed to refresh status for %s: %s", ", ".join(names), exc, exc_info=True)
+                for button_id in stale:
+                    await self._record_refresh_failure(button_id, exc)
+            else:
+                for button_id in stale:
+                    # A workflow may have started while the listing was in flight
+                    if self._statuses[button_id].running:
+                        continue
+                    server = servers.get(self._buttons[button_id].instance_name)
+                    await self._record_server_status(button_id, server)
+
+        return {button_id: self._statuses[button_id] for button_id in selected}
+
+    async def _record_server_status(self, button_id: str, server: Optional[Server]) -> ButtonStatus:
+        self._refreshed_at[button_id] = time.monotonic()
+        return await self._update_status(button_id, message=_describe_server(server))
+
+    async def _record_refresh_failure(self, button_id: str, exc: Exception) -> ButtonStatus:
+        if button_id in self._refreshed_at:
+            # Keep serving the last good status through transient OpenStack outages,
+            # flagging the failure without overwriting the stored status
+            error = f"OpenStack unavailable: {exc}"
+            flagged = replace(self._statuses[button_id], error=error)
+            if self._stale_errors.get(button_id) != error:
+                self._stale_errors[button_id] = error
+                self._publish(flagged)
+            return flagged
         return await self._update_status(
             button_id,
-            message=f"Instance status: {display_status}.",
+            message="Unable to query OpenStack status right now.",
         )
 
+    def _is_fresh(self, button_id: str) -> bool:
+        refreshed_at = self._refreshed_at.get(button_id)
+        if refreshed_at is None:
+            return False
+        return time.monotonic() - refreshed_at < self._app_settings.poll_interval_seconds / 2
+
+    async def subscribe(self, button_id: str) -> AsyncIterator[ButtonStatus]:
+        """Yield the current status of a button, then again every time it changes.
+
+        A single background task refreshes OpenStack status for all subscribed
+        buttons once per poll interval, regardless of the number of subscribers.
+        """
+
+        if button_id not in self._buttons:
+            raise KeyError(f"Unknown button id '{button_id}'")
+
+        queue: asyncio.Queue[ButtonStatus] = asyncio.Queue()
+        # Start from a snapshot so changes made before (re)connecting are not lost
+        queue.put_nowait(replace(self._statuses[button_id]))
+        self._subscribers[button_id].add(queue)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_subscribed())
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[button_id].discard(queue)
+
+    async def _poll_subscribed(self) -> None:
+        while True:
+            button_ids = [button_id for button_id, queues in self._subscribers.items() if queues]
+            if not button_ids:
+                return
+            try:
+                await self.refresh_all_statuses(button_ids)
+            except Exception as exc:  # noqa: BLE001
+                _LOGGER.exception("Background status refresh failed", exc_info=exc)
+            await asyncio.sleep(self._app_settings.poll_interval_seconds)
+
+    def _publish(self, status: ButtonStatus) -> None:
+        queues = self._subscribers[status.button_id]
+        if not queues:
+            return
+        # Statuses are updated in place, so subscribers get a snapshot of this change
+        snapshot = replace(status)
+        for queue in queues:
+            queue.put_nowait(snapshot)
+
     async def start_unshelve(self, button_id: str) -> ButtonStatus:
         button = self._buttons.get(button_id)
         if not button:
             raise KeyError(f"Unknown button id '{button_id}'")
 
-        async with self._lock:
+        async with self._locks[button_id]:
             task = self._tasks.get(button_id)
             current = self._statuses[button_id]
             if task and not task.done():
                 return current
-            updated = replace(
-                current,
-                state="unshelving",
-                message="Starting unshelve workflow…",
-                running=True,
-                http_ready=False,
-                error=None,
-                url=None,
-                last_updated=_utcnow(),
-            )
-            self._statuses[button_id] = updated
+            current.state = "unshelving"
+            current.message = "Starting unshelve workflow…"
+            current.running = True
+            current.http_ready = False
+            current.error = None
+            current.url = None
+            current.last_updated = _utcnow()
+            self._publish(current)
             job = asyncio.create_task(self._run_unshelve(button))
             self._tasks[button_id] = job
-            job.add_done_callback(lambda t: asyncio.create_task(self._clear_task(button_id, t)))
-            return updated
+            # Cleanup is synchronous, so it runs straight from the callback without scheduling a task
+            job.add_done_callback(functools.partial(self._clear_task, button_id))
+            return current
 
-    async def _clear_task(self, button_id: str, task: asyncio.Task) -> None:
+    def _clear_task(self, button_id: str, task: asyncio.Task) -> None:
         try:
             exc = task.exception()
             if exc:
                 _LOGGER.exception("Unshelve task for %s raised an exception", button_id, exc_info=exc)
         except asyncio.CancelledError:
             _LOGGER.warning("Unshelve task for %s was cancelled", button_id)
-        async with self._lock:
-            self._tasks.pop(button_id, None)
+        # Only forget the task if a newer one has not replaced it
+        if self._tasks.get(button_id) is task:
+            del self._tasks[button_id]
 
     async def _update_status(
         self,
@@ -183,39 +344,47 @@ class InstanceActionManager:
         http_ready: Optional[bool] = None,
         error: Any = _UNSET,
     ) -> ButtonStatus:
-        async with self._lock:
-            status = self._statuses[button_id]
-            new_status = replace(
-                status,
-                state=state or status.state,
-                message=message or status.message,
-                running=status.running if running is None else running,
-                url=status.url if url is _UNSET else url,
-                http_ready=status.http_ready if http_ready is None else http_ready,
-                error=status.error if error is _UNSET else error,
-                last_updated=_utcnow(),
-            )
-            self._statuses[button_id] = new_status
-            return new_status
+        # Nothing below awaits, so the in-place update cannot interleave with other
+        # coroutines and needs no lock
+        status = self._statuses[button_id]
+        before = _fingerprint(status)
+        # Subscribers last saw the outage flag, which the stored status does not carry
+        was_flagged = self._stale_errors.pop(button_id, None) is not None
+        if state:
+            status.state = state
+        if message:
+            status.message = message
+        if running is not None:
+            status.running = running
+        if url is not _UNSET:
+            status.url = url
+        if http_ready is not None:
+            status.http_ready = http_ready
+        if error is not _UNSET:
+            status.error = error
+        status.last_updated = _utcnow()
+        if was_flagged or _fingerprint(status) != before:
+            self._publish(status)
+        return status
 
     async def _run_unshelve(self, button: ButtonSettings) -> None:
         button_id = button.id
         try:
-            server = await asyncio.to_thread(self._client.find_server, button.instance_name)
+            server = await self._run_blocking(self._client.find_server, button.instance_name)
             if not server:
                 raise ResourceNotFound(f"Instance '{button.instance_name}' not found")
 
-            status = (server.status or "").upper()
+            status = server_status(server)
             await self._update_status(
                 button_id,
                 message=f"Current OpenStack status: {_format_openstack_status(status or 'UNKNOWN')}.",
-                state="unshelving" if status in {"SHELVED", "SHELVED_OFFLOADED"} else "booting",
+                state="unshelving" if status in _SHELVED_STATES else "booting",
             )
 
-            if status in {"SHELVED", "SHELVED_OFFLOADED"}:
+            if status in _SHELVED_STATES:
                 await self._update_status(button_id, message="Requesting unshelve from OpenStack…")
                 try:
-                    await asyncio.to_thread(self._client.unshelve_server, server.id)
+                    await self._run_blocking(self._client.unshelve_server, server.id)
                 except SDKException as exc:
                     raise RuntimeError(f"Failed to unshelve instance: {exc}") from exc
             else:
@@ -226,7 +395,8 @@ class InstanceActionManager:
                 )
 
             server = await self._wait_until_active(button_id, server.id, initial=server)
-            endpoint = self._client.build_endpoint(server, button)
+            # Address selection may query Designate, so it runs on the worker pool too
+            endpoint = await self._run_blocking(self._client.build_endpoint, server, button)
             if not endpoint:
                 await self._update_status(
                     button_id,
@@ -283,23 +453,33 @@ class InstanceActionManager:
         *,
         initial: Optional[Server] = None,
     ) -> Server:
-        poll = self._app_settings.poll_interval_seconds
+        base_interval = self._app_settings.poll_interval_seconds
+        max_interval = max(_MAX_BOOT_POLL_SECONDS, base_interval)
         server = initial
+        last_status: Optional[str] = None
+        interval: float = base_interval
         while True:
             if server is None:
-                server = await asyncio.to_thread(self._client.get_server, server_id)
-            status = (getattr(server, "status", None) or "").upper()
+                server = await self._run_blocking(self._client.get_server, server_id)
+            status = server_status(server)
             if status == "ACTIVE":
                 return server
-            if status in {"ERROR", "UNKNOWN"}:
+            if status in _FAILED_STATES:
                 raise RuntimeError(f"Instance entered {status} state")
-            await self._update_status(
-                button_id,
-                state="booting",
-                message=f"Instance status: {status or 'UNKNOWN'}. Re-checking in {poll}s…",
-            )
-            await asyncio.sleep(poll)
-            server = await asyncio.to_thread(self._client.get_server, server_id)
+            # Only touch the shared status when OpenStack reports something new
+            if status != last_status:
+                await self._update_status(
+                    button_id,
+                    state="booting",
+                    message=f"Instance status: {status or 'UNKNOWN'}. Waiting for it to become ACTIVE…",
+                )
+                last_status = status
+                interval = base_interval
+            else:
+                # Back off while the state is stable; unshelving routinely takes tens of seconds
+                interval = min(max_interval, interval * 1.5)
+            await asyncio.sleep(interval)
+            server = await self._run_blocking(self._client.get_server, server_id)
 
     async def _probe_http(
         self,
@@ -312,21 +492,52 @@ class InstanceActionManager:
         timeout = self._app_settings.http_probe_timeout
         last_detail: Optional[str] = None
 
-        async with httpx.AsyncClient(timeout=timeout, verify=endpoint.verify_tls, follow_redirects=True) as client:
-            for attempt in range(1, attempts + 1):
-                await self._update_status(
-                    button_id,
-                    state="checking_http",
-                    message=f"Checking service availability ({attempt}/{attempts})…",
-                )
-                try:
-                    response = await client.get(endpoint.healthcheck_url)
-                    if response.status_code < 400:
-                        return True, None
-                    last_detail = f"HTTP {response.status_code}"
-                except httpx.HTTPError as exc:
-                    last_detail = str(exc)
-                if attempt < attempts:
-                    await asyncio.sleep(interval)
+        client = self._get_http_client(endpoint.verify_tls, timeout)
+        for attempt in range(1, attempts + 1):
+            await self._update_status(
+                button_id,
+                state="checking_http",
+                message=f"Checking service availability ({attempt}/{attempts})…",
+            )
+            try:
+                response = await client.get(endpoint.healthcheck_url)
+                if response.status_code < 400:
+                    return True, None
+                last_detail = f"HTTP {response.status_code}"
+            except httpx.HTTPError as exc:
+                last_detail = str(exc)
+            if attempt < attempts:
+                await asyncio.sleep(interval)
 
         return False, last_detail
+
+    def _get_http_client(self, verify_tls: bool, timeout: float) -> httpx.AsyncClient:
+        key = (verify_tls, timeout)
+        client = self._http_clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=timeout,
+                verify=verify_tls,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=len(self._buttons), keepalive_expiry=30),
+            )
+            self._http_clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Stop the status poller, then close the HTTP probe clients and the OpenStack worker pool."""
+
+        poller, self._poller = self._poller, None
+        if poller is not None and not poller.done():
+            poller.cancel()
+            try:
+                await poller
+            except asyncio.CancelledError:
+                pass
+
+        clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in clients:
+            await client.aclose()
+        # Wait for in-flight OpenStack calls off the loop so the client's connections are idle before they are closed
+        await asyncio.to_thread(functools.partial(self._executor.shutdown, wait=True, cancel_futures=True))
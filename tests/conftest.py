@@ -1,6 +1,68 @@
+import asyncio
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from openstack_unshelver_webapp.config import ConfigurationError, Settings, load_settings  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def live_settings() -> Settings:
+    """Settings from the local config.yaml, loaded once for all live checks."""
+
+    try:
+        return load_settings()
+    except ConfigurationError as exc:
+        pytest.skip(f"Skipping live credential check: {exc}")
+
+
+_real_sleep = asyncio.sleep
+
+
+# The health probe only reads status_code and text
+_SUCCESS_RESPONSE = SimpleNamespace(status_code=200, text="OK")
+
+
+class StubHttpClient:
+    async def aclose(self):
+        pass
+
+    async def get(self, url):
+        return _SUCCESS_RESPONSE
+
+
+# Stateless, so every test can use the same instance
+_SHARED_STUB_HTTP = StubHttpClient()
+
+
+@pytest.fixture
+def fast_async(monkeypatch):
+    """Run manager OpenStack calls inline, skip real sleeps and answer HTTP probes with 200."""
+
+    def run_inline(self, func, *args):
+        # An already-resolved future is awaitable without creating a coroutine frame
+        future = asyncio.get_running_loop().create_future()
+        try:
+            future.set_result(func(*args))
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        return future
+
+    async def fast_sleep(_: float):
+        # Still yield to the loop so background tasks such as the SSE poller make progress
+        await _real_sleep(0)
+
+    # Patched by dotted path so the OpenStack SDK is only imported by tests that use this
+    monkeypatch.setattr(
+        "openstack_unshelver_webapp.unshelve_manager.InstanceActionManager._run_blocking",
+        run_inline,
+    )
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: _SHARED_STUB_HTTP)
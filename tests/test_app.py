@@ -0,0 +1,118 @@
+import base64
+import importlib
+import json
+import textwrap
+from datetime import datetime, timezone
+
+import pytest
+from itsdangerous import TimestampSigner
+from starlette.testclient import TestClient
+
+from openstack_unshelver_webapp.unshelve_manager import ButtonStatus
+
+
+APP_CONFIG = textwrap.dedent(
+    """
+    app:
+      title: Test
+      secret_key: 1234567890abcdef
+    github:
+      client_id: cid
+      client_secret: secret
+      redirect_uri: http://localhost/callback
+      organization: acme
+    openstack:
+      auth_url: https://example.com
+      username: user
+      password: pass
+      project_name: proj
+    buttons:
+      - id: button-one
+        label: App One
+        instance_name: instance-one
+    """
+).strip()
+
+
+@pytest.fixture(scope="module")
+def webapp(tmp_path_factory):
+    # app.py loads its settings at import time, so point it at a throwaway config first
+    config = tmp_path_factory.mktemp("app") / "config.yaml"
+    config.write_text(APP_CONFIG)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("UNSHELVER_CONFIG", str(config))
+        return importlib.import_module("app")
+
+
+@pytest.fixture
+def client(webapp):
+    # Built without entering the context manager, so the startup hook does not call OpenStack
+    client = TestClient(webapp.app)
+    payload = base64.b64encode(json.dumps({"user": {"login": "octocat"}}).encode())
+    client.cookies.set("session_", TimestampSigner(webapp.SETTINGS.app.secret_key).sign(payload).decode())
+    return client
+
+
+def _status(**changes):
+    values = {
+        "button_id": "button-one",
+        "instance_name": "instance-one",
+        "state": "idle",
+        "message": "Instance status: Shelved.",
+        "running": False,
+        "last_updated": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+    values.update(changes)
+    return ButtonStatus(**values)
+
+
+def test_status_fragment_escapes_dynamic_values(webapp):
+    fragment = webapp._status_fragment(
+        "button-one",
+        _status(
+            instance_name="<b>instance</b>",
+            message="<script>alert(1)</script>",
+            url='http://example.com/?a=1&b="2"',
+            error="<i>boom</i>",
+        ),
+    )
+
+    assert "&lt;b&gt;instance&lt;/b&gt;" in fragment
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in fragment
+    assert 'href="http://example.com/?a=1&amp;b=&quot;2&quot;"' in fragment
+    assert "Error: &lt;i&gt;boom&lt;/i&gt;" in fragment
+    assert "<script>" not in fragment and "<b>" not in fragment and "<i>" not in fragment
+
+
+def test_status_fragment_renders_idle_and_running_buttons(webapp):
+    idle = webapp._status_fragment("button-one", _status())
+    assert "Unshelve &amp; start" in idle
+    assert '<button class="btn btn-primary"' in idle
+
+    running = webapp._status_fragment("button-one", _status(state="unshelving", running=True))
+    assert "Working…" in running
+    assert '<button disabled class="btn disabled"' in running
+    assert 'hx-post="/action/button-one"' in running
+
+
+def test_status_view_answers_matching_etag_with_304(webapp, client, monkeypatch):
+    status = _status()
+
+    async def refresh(button_id):
+        return status
+
+    monkeypatch.setattr(webapp.MANAGER, "refresh_openstack_status", refresh)
+
+    first = client.get("/status/button-one")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/status/button-one", headers={"If-None-Match": f'W/"other", {etag}'})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    status.message = "Instance status: Active."
+    changed = client.get("/status/button-one", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -1,38 +1,47 @@
 import textwrap
+from pathlib import Path
 
 import pytest
 
-from openstack_unshelver_webapp.config import ConfigurationError, Settings, load_settings
+from openstack_unshelver_webapp.config import (
+    ButtonSettings,
+    ConfigurationError,
+    OpenStackSettings,
+    Settings,
+    clear_settings_cache,
+    load_settings,
+)
+
+
+VALID_CONFIG = textwrap.dedent(
+    """
+    app:
+      title: Test
+      secret_key: 1234567890abcdef
+      poll_interval_seconds: 10
+      http_probe_timeout: 5
+      http_probe_attempts: 3
+    github:
+      client_id: cid
+      client_secret: secret
+      redirect_uri: http://localhost/callback
+      organization: acme
+    openstack:
+      auth_url: https://example.com
+      username: user
+      password: pass
+      project_name: proj
+    buttons:
+      - id: button-one
+        label: App One
+        instance_name: instance-one
+    """
+).strip()
 
 
 def test_load_settings_success(tmp_path):
     config = tmp_path / "config.yaml"
-    config.write_text(
-        textwrap.dedent(
-            """
-            app:
-              title: Test
-              secret_key: 1234567890abcdef
-              poll_interval_seconds: 10
-              http_probe_timeout: 5
-              http_probe_attempts: 3
-            github:
-              client_id: cid
-              client_secret: secret
-              redirect_uri: http://localhost/callback
-              organization: acme
-            openstack:
-              auth_url: https://example.com
-              username: user
-              password: pass
-              project_name: proj
-            buttons:
-              - id: button-one
-                label: App One
-                instance_name: instance-one
-            """
-        ).strip()
-    )
+    config.write_text(VALID_CONFIG)
 
     settings = load_settings(str(config))
 
@@ -66,3 +75,73 @@ def test_load_settings_raises_on_invalid(tmp_path):
 
     with pytest.raises(ConfigurationError):
         load_settings(str(config))
+
+
+def test_load_settings_caches_by_content(tmp_path, monkeypatch):
+    config = tmp_path / "config.yaml"
+    config.write_text(VALID_CONFIG)
+
+    first = load_settings(str(config))
+    assert load_settings(str(config)) is first
+
+    config.write_text(VALID_CONFIG.replace("title: Test", "title: Changed"))
+    assert load_settings(str(config)).app.title == "Changed"
+
+    monkeypatch.setenv("UNSHELVER_SKIP_CACHE", "1")
+    config.write_text(VALID_CONFIG)
+    assert load_settings(str(config)) is not first
+
+
+def test_load_settings_skips_reading_unchanged_file(tmp_path, monkeypatch):
+    clear_settings_cache()
+    config = tmp_path / "config.yaml"
+    config.write_text(VALID_CONFIG)
+    first = load_settings(str(config))
+
+    monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail("unchanged config was re-read"))
+    assert load_settings(str(config)) is first
+
+    clear_settings_cache()
+    monkeypatch.undo()
+    assert load_settings(str(config)) is not first
+
+
+def test_load_settings_reports_non_string_keys_as_configuration_error(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(VALID_CONFIG.replace("openstack:\n", "openstack:\n  1: x\n"))
+
+    with pytest.raises(ConfigurationError, match="validation"):
+        load_settings(str(config))
+
+
+def test_button_paths_are_normalised():
+    button = ButtonSettings(
+        id="button-one",
+        label="App One",
+        instance_name="instance-one",
+        healthcheck_path="health",
+        launch_path="/lab",
+    )
+
+    assert button.healthcheck_path == "/health"
+    assert button.launch_path == "/lab"
+    assert ButtonSettings(id="b", label="B", instance_name="i").launch_path is None
+
+
+def test_openstack_connection_kwargs_are_built_once():
+    settings = OpenStackSettings(
+        auth_url="https://example.com",
+        username="user",
+        password="pass",
+        project_name="proj",
+        cloud="extra",
+    )
+
+    kwargs = settings.as_kwargs
+    assert kwargs is settings.as_kwargs
+    assert kwargs["auth_url"] == "https://example.com/"
+    assert kwargs["cloud"] == "extra"
+    assert "region_name" not in kwargs
+    assert kwargs == settings.model_dump(exclude_none=True, mode="json")
+    with pytest.raises(TypeError):
+        kwargs["username"] = "other"
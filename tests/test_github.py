@@ -24,12 +24,10 @@ class FakeResponse:
 class StubAsyncClient:
     def __init__(self, responses):
         self._responses = responses
+        self.closed = False
 
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
+    async def aclose(self):
+        self.closed = True
 
     async def post(self, url, *_, **__):
         return self._responses[("POST", url)]
@@ -57,7 +55,6 @@ def test_authorization_url_contains_required_params(github_settings):
     assert "state=state123" in url
 
 
-@pytest.mark.asyncio
 async def test_exchange_code_for_token_success(monkeypatch, github_settings):
     responses = {
         ("POST", "https://github.com/login/oauth/access_token"): FakeResponse(
@@ -72,7 +69,6 @@ async def test_exchange_code_for_token_success(monkeypatch, github_settings):
     assert token.access_token == "token"
 
 
-@pytest.mark.asyncio
 async def test_exchange_code_for_token_failure(monkeypatch, github_settings):
     responses = {
         ("POST", "https://github.com/login/oauth/access_token"): FakeResponse(status_code=400, text="boom")
@@ -84,7 +80,6 @@ async def test_exchange_code_for_token_failure(monkeypatch, github_settings):
         await oauth.exchange_code_for_token("abc")
 
 
-@pytest.mark.asyncio
 async def test_fetch_user(monkeypatch, github_settings):
     token = GitHubToken(access_token="t", token_type="bearer", scope="read:user")
     responses = {
@@ -101,7 +96,6 @@ async def test_fetch_user(monkeypatch, github_settings):
     assert user.display_name == "User"
 
 
-@pytest.mark.asyncio
 async def test_verify_membership(monkeypatch, github_settings):
     token = GitHubToken(access_token="t", token_type="bearer", scope="read:org")
     responses = {
@@ -119,3 +113,30 @@ async def test_verify_membership(monkeypatch, github_settings):
         f"{GITHUB_API_BASE}/user/memberships/orgs/{github_settings.organization}",
     )] = FakeResponse(status_code=404)
     assert not await oauth.verify_membership(token)
+
+
+async def test_http_client_is_shared_until_closed(monkeypatch, github_settings):
+    token = GitHubToken(access_token="t", token_type="bearer", scope="read:user")
+    responses = {
+        ("GET", f"{GITHUB_API_BASE}/user"): FakeResponse(json_data={"login": "user"}),
+        ("GET", f"{GITHUB_API_BASE}/user/memberships/orgs/{github_settings.organization}"): FakeResponse(
+            json_data={"state": "active"}
+        ),
+    }
+    created = []
+
+    def fake_client(*args, **kwargs):
+        created.append(StubAsyncClient(responses))
+        return created[-1]
+
+    monkeypatch.setattr(httpx, "AsyncClient", fake_client)
+
+    oauth = GitHubOAuth(github_settings)
+    await oauth.fetch_user(token)
+    await oauth.verify_membership(token)
+    assert len(created) == 1
+
+    await oauth.aclose()
+    assert created[0].closed
+    await oauth.fetch_user(token)
+    assert len(created) == 2
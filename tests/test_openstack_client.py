@@ -0,0 +1,241 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openstack_unshelver_webapp.config import OpenStackSettings
+from openstack_unshelver_webapp import openstack_client
+from openstack_unshelver_webapp.openstack_client import InstanceEndpoint, OpenStackClient, select_address
+
+
+class AddressedServer:
+    def __init__(self, addresses, access_v4=None):
+        self.addresses = addresses
+        self.accessIPv4 = access_v4
+
+
+def _entry(addr, version=4, kind="fixed"):
+    return {"addr": addr, "version": version, "OS-EXT-IPS:type": kind}
+
+
+class FakeCompute:
+    def find_server(self, name, ignore_missing=True):
+        return {"name": name}
+
+
+class FakeDns:
+    def __init__(self):
+        self.sweeps = 0
+
+    def zones(self):
+        self.sweeps += 1
+        return [{"id": "zone-1"}]
+
+    def recordsets(self, zone_id, **query):
+        recordsets = [
+            {"type": "A", "name": "app.example.org.", "records": ["203.0.113.5"]},
+            {"type": "AAAA", "name": "v6.example.org.", "records": ["fd00::5"]},
+        ]
+        if "type" in query:
+            recordsets = [recordset for recordset in recordsets if recordset["type"] == query["type"]]
+        return recordsets
+
+
+class FakeConnection:
+    def __init__(self, has_dns=True):
+        self.compute = FakeCompute()
+        self.dns = FakeDns()
+        self.has_dns = has_dns
+        self.closed = False
+
+    def has_service(self, service_type):
+        return service_type == "dns" and self.has_dns
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def openstack_settings():
+    return OpenStackSettings(
+        auth_url="https://example.com",
+        username="user",
+        password="pass",
+        project_name="proj",
+    )
+
+
+def test_connection_is_reused_until_closed(monkeypatch, openstack_settings):
+    client = OpenStackClient(openstack_settings)
+    created = []
+
+    def fake_create_connection():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    monkeypatch.setattr(client, "create_connection", fake_create_connection)
+
+    assert client.find_server("one") == {"name": "one"}
+    assert client.find_server("two") == {"name": "two"}
+    assert len(created) == 1
+
+    client.close()
+    assert created[0].closed
+
+    client.find_server("three")
+    assert len(created) == 2
+
+
+def test_each_thread_gets_its_own_connection(monkeypatch, openstack_settings):
+    client = OpenStackClient(openstack_settings)
+    created = []
+
+    def fake_create_connection():
+        created.append(FakeConnection())
+        return created[-1]
+
+    monkeypatch.setattr(client, "create_connection", fake_create_connection)
+
+    client.find_server("main")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(client.find_server, "worker").result()
+        pool.submit(client.find_server, "worker").result()
+    client.find_server("main")
+    assert len(created) == 2
+
+    client.close()
+    assert all(conn.closed for conn in created)
+
+
+class NamedServer:
+    def __init__(self, server_id, name):
+        self.id = server_id
+        self.name = name
+
+
+class ListingCompute:
+    def __init__(self, servers):
+        self._servers = servers
+        self.queries = []
+        self.found = []
+
+    def servers(self, **query):
+        self.queries.append(query)
+        return [server for server in self._servers if re.fullmatch(query["name"], server.name)]
+
+    def find_server(self, name_or_id, ignore_missing=True):
+        self.found.append(name_or_id)
+        return next((server for server in self._servers if server.id == name_or_id), None)
+
+
+def test_list_servers_filters_by_name_and_falls_back_to_find_for_ids(monkeypatch, openstack_settings):
+    server_id = "3f2c9a1e-8d4b-4c55-9a57-0b6f1d2e7c10"
+    conn = FakeConnection()
+    conn.compute = ListingCompute(
+        [NamedServer("id-1", "app.one"), NamedServer("id-2", "appXone"), NamedServer(server_id, "other")]
+    )
+    client = OpenStackClient(openstack_settings)
+    monkeypatch.setattr(client, "create_connection", lambda: conn)
+
+    servers = client.list_servers(["app.one", server_id, "missing"])
+
+    assert conn.compute.queries == [
+        {"details": True, "name": r"^(app\.one|3f2c9a1e\-8d4b\-4c55\-9a57\-0b6f1d2e7c10|missing)$"}
+    ]
+    assert servers["app.one"].id == "id-1"
+    assert servers[server_id].name == "other"
+    assert "missing" not in servers
+    # A plain name the listing missed is absent, so only the ID gets a lookup
+    assert conn.compute.found == [server_id]
+
+
+def test_select_address_prefers_configured_network():
+    server = AddressedServer(
+        {
+            "public": [_entry("203.0.113.5", kind="floating")],
+            "private": [_entry("fd00::5", version=6), _entry("10.0.0.5")],
+        }
+    )
+
+    assert select_address(server, ["missing", "private"]) == "10.0.0.5"
+
+
+def test_select_address_prefers_floating_then_ipv4():
+    server = AddressedServer(
+        {
+            "private": [_entry("10.0.0.5")],
+            "public": [_entry("203.0.113.5", kind="floating")],
+        }
+    )
+    assert select_address(server) == "203.0.113.5"
+
+    server = AddressedServer(
+        {
+            "v6only": [_entry("fd00::5", version=6)],
+            "private": [_entry("10.0.0.5"), _entry("10.0.0.6")],
+        }
+    )
+    assert select_address(server) == "10.0.0.5"
+
+
+def test_select_address_skips_invalid_entries_and_falls_back_to_access_ip():
+    server = AddressedServer({"private": [{"addr": ""}, "bogus"]}, access_v4="198.51.100.7")
+
+    assert select_address(server) == "198.51.100.7"
+
+
+def test_instance_endpoint_urls():
+    endpoint = InstanceEndpoint(
+        address="fd00::5",
+        scheme="https",
+        port=8443,
+        launch_path="/lab",
+        healthcheck_path="/health",
+        verify_tls=True,
+    )
+
+    assert endpoint.base_url == "https://[fd00::5]:8443"
+    assert endpoint.launch_url == "https://[fd00::5]:8443/lab"
+    assert endpoint.healthcheck_url == "https://[fd00::5]:8443/health"
+
+    default_port = InstanceEndpoint("app.example.org", "http", 80, "/", "/", False)
+    assert default_port.launch_url == "http://app.example.org/"
+
+
+def test_dns_lookups_share_one_sweep_and_cache_misses(monkeypatch, openstack_settings):
+    monkeypatch.setattr(openstack_client, "_DNS_CACHE", {})
+    monkeypatch.setattr(openstack_client, "_DESIGNATE_AVAILABLE", None)
+    conn = FakeConnection()
+    client = OpenStackClient(openstack_settings)
+    monkeypatch.setattr(client, "create_connection", lambda: conn)
+
+    assert client._resolve_dns_name("198.51.100.9") is None
+    assert client._resolve_dns_name("203.0.113.5") == "app.example.org"
+    assert client._resolve_dns_name("198.51.100.9") is None
+    assert client._resolve_dns_name("app.example.org") == "app.example.org"
+    assert conn.dns.sweeps == 1
+
+    # Other clients in the process reuse the cache
+    other = OpenStackClient(openstack_settings)
+    monkeypatch.setattr(other, "create_connection", lambda: pytest.fail("cache miss"))
+    assert other._resolve_dns_name("203.0.113.5") == "app.example.org"
+
+
+def test_dns_lookup_skipped_without_designate(monkeypatch, openstack_settings):
+    monkeypatch.setattr(openstack_client, "_DNS_CACHE", {})
+    monkeypatch.setattr(openstack_client, "_DESIGNATE_AVAILABLE", None)
+    created = []
+
+    def fake_create_connection():
+        created.append(FakeConnection(has_dns=False))
+        return created[-1]
+
+    client = OpenStackClient(openstack_settings)
+    monkeypatch.setattr(client, "create_connection", fake_create_connection)
+
+    assert client._resolve_dns_name("203.0.113.5") is None
+    client.close()
+    assert client._resolve_dns_name("198.51.100.9") is None
+    assert len(created) == 1
+    assert created[0].dns.sweeps == 0
@@ -1,8 +1,9 @@
 import asyncio
+import inspect
 
 import httpx
 import pytest
-import pytest_asyncio
+from openstack.exceptions import SDKException
 
 from openstack_unshelver_webapp.config import AppSettings, ButtonSettings
 from openstack_unshelver_webapp.openstack_client import InstanceEndpoint
@@ -10,6 +11,8 @@ from openstack_unshelver_webapp.unshelve_manager import ButtonStatus, InstanceAc
 
 
 class DummyServer:
+    __slots__ = ("id", "status", "addresses")
+
     def __init__(self, server_id: str, status: str, addresses=None):
         self.id = server_id
         self.status = status
@@ -19,7 +22,9 @@ class DummyServer:
 class DummyClient:
     def __init__(self):
         self.unshelve_calls = 0
-        self._get_calls = 0
+        self.find_calls = 0
+        self.list_calls = 0
+        self.find_error = None
         self._active_server = DummyServer(
             "server-1",
             "ACTIVE",
@@ -32,103 +37,159 @@ class DummyClient:
                 ]
             },
         )
+        self._shelved_servers = {"instance-one": DummyServer("server-1", "SHELVED")}
+        # get_server reports SHELVED once, then ACTIVE from then on
+        self._server_sequence = iter([DummyServer("server-1", "SHELVED")])
+        self._endpoint_cache = {}
 
     def find_server(self, instance_name):
-        if instance_name != "instance-one":
-            return None
-        return DummyServer("server-1", "SHELVED")
+        self.find_calls += 1
+        if self.find_error:
+            raise self.find_error
+        return self._shelved_servers.get(instance_name)
+
+    def list_servers(self, instance_names):
+        self.list_calls += 1
+        if self.find_error:
+            raise self.find_error
+        return {name: self._shelved_servers[name] for name in instance_names if name in self._shelved_servers}
 
     def unshelve_server(self, server_id):
         self.unshelve_calls += 1
 
     def get_server(self, server_id):
-        self._get_calls += 1
-        if self._get_calls == 1:
-            return DummyServer("server-1", "SHELVED")
-        return self._active_server
+        return next(self._server_sequence, self._active_server)
 
     def build_endpoint(self, server, button):
-        return InstanceEndpoint(
-            address="1.2.3.4",
-            scheme=button.url_scheme,
-            port=button.port,
-            launch_path=button.launch_path or "/",
-            healthcheck_path=button.healthcheck_path,
-            verify_tls=button.verify_tls,
-        )
+        # The dummy address never changes and endpoints are frozen, so one per button is enough
+        endpoint = self._endpoint_cache.get(button.id)
+        if endpoint is None:
+            endpoint = self._endpoint_cache[button.id] = InstanceEndpoint(
+                address="1.2.3.4",
+                scheme=button.url_scheme,
+                port=button.port,
+                launch_path=button.launch_path or "/",
+                healthcheck_path=button.healthcheck_path,
+                verify_tls=button.verify_tls,
+            )
+        return endpoint
+
+
+class RecordingHttpClient:
+    """Probe client that records whether it was closed."""
 
-
-class SuccessResponse:
     def __init__(self):
-        self.status_code = 200
-        self.text = "OK"
-
-    def json(self):  # pragma: no cover - compatibility only
-        return {"status": "ok"}
+        self.closed = False
 
+    async def aclose(self):
+        self.closed = True
 
-class StubHttpClient:
-    async def __aenter__(self):
-        return self
 
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def get(self, url):
-        return SuccessResponse()
-
-
-@pytest_asyncio.fixture
-async def manager(monkeypatch):
-    app_settings = AppSettings(
+@pytest.fixture(scope="session")
+def app_settings():
+    return AppSettings(
         title="Test",
         secret_key="1234567890abcdef",
         poll_interval_seconds=1,
         http_probe_timeout=1,
         http_probe_attempts=1,
     )
-    button = ButtonSettings(
+
+
+@pytest.fixture(scope="session")
+def button():
+    return ButtonSettings(
         id="button-one",
         label="Button",
         instance_name="instance-one",
         url_scheme="http",
         healthcheck_path="/health",
     )
-    client = DummyClient()
-    mgr = InstanceActionManager(app_settings, {button.id: button}, client)
-
-    async def immediate_to_thread(func, *args, **kwargs):
-        return func(*args, **kwargs)
-
-    async def fast_sleep(_: float):
-        return None
 
-    monkeypatch.setattr(asyncio, "to_thread", immediate_to_thread)
-    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
-    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: StubHttpClient())
 
-    return mgr
+@pytest.fixture
+def manager(fast_async, app_settings, button):
+    # The settings are immutable inputs and shared; the manager and its client hold
+    # per-test state and event-loop bound primitives, so they are built fresh
+    client = DummyClient()
+    return InstanceActionManager(app_settings, {button.id: button}, client)
 
 
-@pytest.mark.asyncio
 async def test_unshelve_workflow(manager):
     status = await manager.start_unshelve("button-one")
     assert status.running
 
     task = manager._tasks["button-one"]
-    await task
-    await asyncio.sleep(0)
+    await asyncio.wait_for(task, timeout=1.0)
 
     final_status = manager.get_status("button-one")
     assert final_status.state == "ready"
     assert final_status.http_ready is True
     assert final_status.url.endswith("/")
-    remaining = manager._tasks.get("button-one")
-    if remaining is not None:
-        assert remaining.done()
+    # The done callback registered by start_unshelve runs before the awaiting test resumes
+    assert "button-one" not in manager._tasks
+
+
+async def test_probe_client_is_reused_until_closed(manager, monkeypatch):
+    monkeypatch.setattr(httpx, "AsyncClient", lambda *args, **kwargs: RecordingHttpClient())
+    first = manager._get_http_client(True, 1.0)
+    assert manager._get_http_client(True, 1.0) is first
+    assert manager._get_http_client(False, 1.0) is not first
+
+    await manager.aclose()
+    assert first.closed
+    assert manager._get_http_client(True, 1.0) is not first
+
+
+async def test_wait_until_active_backs_off_and_updates_on_change(manager, monkeypatch):
+    servers = iter(
+        [DummyServer("server-1", status) for status in ("SPAWNING", "SPAWNING", "SPAWNING")]
+        + [manager._client._active_server]
+    )
+    monkeypatch.setattr(manager._client, "get_server", lambda server_id: next(servers))
+    updates = []
+    update_status = manager._update_status
+
+    async def record_update(button_id, **changes):
+        updates.append(changes["message"])
+        return await update_status(button_id, **changes)
+
+    monkeypatch.setattr(manager, "_update_status", record_update)
+    delays = []
+
+    async def record_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+
+    server = await manager._wait_until_active("button-one", "server-1", initial=DummyServer("server-1", "SHELVED"))
+
+    assert server.status == "ACTIVE"
+    assert updates == [
+        "Instance status: SHELVED. Waiting for it to become ACTIVE…",
+        "Instance status: SPAWNING. Waiting for it to become ACTIVE…",
+    ]
+    # The poll interval grows while the state is unchanged and resets on a transition
+    assert delays == [1, 1, 1.5, 2.25]
+
+
+async def test_wait_until_active_backoff_stays_capped(manager, monkeypatch):
+    polls = 2000
+    servers = iter([DummyServer("server-1", "SPAWNING")] * polls + [manager._client._active_server])
+    monkeypatch.setattr(manager._client, "get_server", lambda server_id: next(servers))
+    delays = []
+
+    async def record_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+
+    await manager._wait_until_active("button-one", "server-1")
+
+    assert len(delays) == polls
+    assert max(delays) == 30
 
 
-@pytest.mark.asyncio
 async def test_start_unshelve_ignores_duplicate_requests(manager):
     status = await manager.start_unshelve("button-one")
     task = manager._tasks["button-one"]
@@ -137,14 +198,134 @@ async def test_start_unshelve_ignores_duplicate_requests(manager):
     assert second_status.running
     assert manager._tasks["button-one"] is task
 
-    await task
-    await asyncio.sleep(0)
+    await asyncio.wait_for(task, timeout=1.0)
+    assert "button-one" not in manager._tasks
 
 
-@pytest.mark.asyncio
-async def test_unknown_button(manager):
-    with pytest.raises(KeyError):
-        await manager.start_unshelve("missing")
+async def test_refresh_openstack_status_coalesces_concurrent_calls(manager):
+    client = manager._client
+    calls_before = client.find_calls
+
+    first, second = await asyncio.gather(
+        manager.refresh_openstack_status("button-one"),
+        manager.refresh_openstack_status("button-one"),
+    )
+
+    assert client.find_calls == calls_before + 1
+    assert first.message == second.message == "Instance status: Shelved."
+
+
+async def test_refresh_openstack_status_keeps_last_good_status_on_failure(manager):
+    await manager.refresh_openstack_status("button-one")
+    manager._refreshed_at["button-one"] -= 60
+    manager._client.find_error = SDKException("keystone unavailable")
+
+    status = await manager.refresh_openstack_status("button-one")
+
+    assert status.message == "Instance status: Shelved."
+    assert status.error == "OpenStack unavailable: keystone unavailable"
+    assert manager.get_status("button-one").error is None
+
+
+async def test_refresh_failure_publishes_stale_flag_to_subscribers(manager):
+    await manager.refresh_all_statuses()
+    manager._refreshed_at["button-one"] -= 60
+    manager._client.find_error = SDKException("keystone unavailable")
+    queue = asyncio.Queue()
+    manager._subscribers["button-one"].add(queue)
+
+    await manager.refresh_all_statuses()
+    await manager.refresh_all_statuses()
+
+    published = queue.get_nowait()
+    assert published.message == "Instance status: Shelved."
+    assert published.error == "OpenStack unavailable: keystone unavailable"
+    assert manager.get_status("button-one").error is None
+    # The unchanged flag is not re-published while the outage lasts
+    assert queue.empty()
+
+    manager._client.find_error = None
+    await manager.refresh_all_statuses()
+
+    recovered = queue.get_nowait()
+    assert recovered.message == "Instance status: Shelved."
+    assert recovered.error is None
+
+
+async def test_refresh_does_not_hide_programming_errors(manager):
+    manager._client.find_error = TypeError("bug")
+
+    with pytest.raises(TypeError):
+        await manager.refresh_openstack_status("button-one")
+
+
+async def test_refresh_all_statuses_uses_single_listing(manager):
+    client = manager._client
+    find_calls_before = client.find_calls
+    list_calls_before = client.list_calls
+
+    statuses = await manager.refresh_all_statuses()
+
+    assert client.list_calls == list_calls_before + 1
+    assert client.find_calls == find_calls_before
+    assert statuses["button-one"].message == "Instance status: Shelved."
+
+    # Freshly refreshed buttons are served from memory
+    await manager.refresh_all_statuses()
+    await manager.refresh_openstack_status("button-one")
+    assert client.list_calls == list_calls_before + 1
+    assert client.find_calls == find_calls_before
+
+
+async def test_initial_statuses_use_single_listing(manager):
+    await manager.prime_statuses()
+
+    assert manager._client.list_calls == 1
+    assert manager._client.find_calls == 0
+    assert manager.get_status("button-one").message == "Instance status: Shelved."
+
+
+async def test_subscribe_receives_status_changes(manager):
+    stream = manager.subscribe("button-one")
+    initial = await anext(stream)
+    assert initial.message == "Fetching OpenStack status…"
+    assert initial is not manager.get_status("button-one")
+
+    await manager.start_unshelve("button-one")
+    status = await asyncio.wait_for(anext(stream), timeout=1)
+    assert status.running
+    assert status.message == "Starting unshelve workflow…"
+
+    await stream.aclose()
+    await manager._tasks["button-one"]
+    await manager._poller
+    assert not manager._subscribers["button-one"]
+
+
+async def test_aclose_cancels_status_poller(manager):
+    stream = manager.subscribe("button-one")
+    await anext(stream)
+    poller = manager._poller
+    assert not poller.done()
+
+    await manager.aclose()
+    assert poller.cancelled()
+    assert manager._poller is None
+
+    await stream.aclose()
+
 
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda manager: manager.start_unshelve("missing"),
+        lambda manager: manager.get_status("missing"),
+        lambda manager: anext(manager.subscribe("missing")),
+    ],
+    ids=["start_unshelve", "get_status", "subscribe"],
+)
+async def test_unknown_button(manager, call):
     with pytest.raises(KeyError):
-        manager.get_status("missing")
+        result = call(manager)
+        if inspect.isawaitable(result):
+            await result